@@ -1,14 +1,19 @@
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Header, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 from datetime import datetime
 import uvicorn
 import logging
+import os
 from dotenv import load_dotenv
 
 # Import services and models
 from services.provider_service import ProviderService
-from models.provider import ErrorResponse, ProviderResponse
+from services.provider_index import load_providers
+from services.query_parser import QueryParseError
+from services.response_cache import ResponseCache, etag_matches, make_etag, negotiate_encoding
+from services.synonyms import SynonymMap
+from models.provider import ErrorResponse, ProviderResponse, RankingPreferences
 
 # Load environment variables
 load_dotenv()
@@ -31,8 +36,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize provider service
-provider_service = ProviderService()
+# Initialize provider service, indexing the data file if one is configured
+PROVIDER_DATA_PATH = os.getenv("PROVIDER_DATA_PATH")
+SYNONYMS_PATH = os.getenv("SYNONYMS_PATH", os.path.join(os.path.dirname(__file__), "synonyms.json"))
+SHARD_KEY = os.getenv("SHARD_KEY", "state")
+provider_service = ProviderService(
+    providers=load_providers(PROVIDER_DATA_PATH) if PROVIDER_DATA_PATH else None,
+    synonyms=SynonymMap.from_file(SYNONYMS_PATH) if os.path.exists(SYNONYMS_PATH) else None,
+    shard_key=SHARD_KEY
+)
+
+# HTTP caching and compression for /providers
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "public, max-age=60")
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    min_compress_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+)
 
 @app.get("/health")
 async def health_check():
@@ -45,26 +64,81 @@ async def health_check():
 
 @app.get("/providers", response_model=ProviderResponse)
 async def fetch_providers(
-    query: Optional[str] = Query(None, description="Search query for provider name, specialty, or description"),
-    stateCode: Optional[str] = Query(None, description="State code filter (e.g., 'CA', 'NY', 'TX')")
+    query: Optional[str] = Query(
+        None,
+        description=(
+            "Search query for provider name, specialty, or description. Supports field:value "
+            "clauses, quoted phrases and AND/OR/NOT, e.g. 'specialty:\"Oral Surgery\" NOT city:austin'"
+        )
+    ),
+    stateCode: Optional[str] = Query(None, description="State code or name filter (e.g., 'CA', 'NY', 'Texas')"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of providers to return"),
+    diversity: Optional[float] = Query(
+        None, ge=0.0, le=1.0,
+        description="Diversify top results by city, zip code and specializations (0 = off, 1 = maximum)"
+    ),
+    preferredLanguage: Optional[str] = Query(None, description="Rank providers who speak this language higher"),
+    preferredGender: Optional[str] = Query(None, description="Rank providers of this gender higher"),
+    maxCostEfficiency: Optional[int] = Query(None, ge=0, description="Rank providers above this cost efficiency rating lower"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """
     Fetch healthcare providers with optional filtering by query and stateCode.
     
-    This endpoint searches providers using the provider service.
+    This endpoint searches providers using the provider service. Responses
+    carry an ETag derived from a digest of the indexed data and the
+    normalized parameters; a matching If-None-Match returns 304 without
+    searching.
+    Bodies are compressed per Accept-Encoding and cached once encoded.
     """
+    preferences = None
+    if any(value is not None for value in (diversity, preferredLanguage, preferredGender, maxCostEfficiency)):
+        preferences = RankingPreferences(
+            preferred_language=preferredLanguage,
+            preferred_gender=preferredGender,
+            max_cost_efficiency=maxCostEfficiency,
+            diversity=diversity or 0.0
+        )
+    
     try:
-        providers = await provider_service.search_providers(
+        cache_key = provider_service.cache_key(
             query=query,
-            state_code=stateCode
+            state_code=stateCode,
+            limit=limit,
+            preferences=preferences
         )
+        etag = make_etag(cache_key)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
         
-        return ProviderResponse(
-            providers=providers,
-            total_count=len(providers),
-            query=query,
-            state_code=stateCode
-        )
+        encoding = negotiate_encoding(accept_encoding)
+        # The body echoes the raw parameters, so they are part of its cache key.
+        body_key = (cache_key, query, stateCode)
+        cached = response_cache.get(body_key, encoding)
+        if cached is None:
+            providers = await provider_service.search_providers(
+                query=query,
+                state_code=stateCode,
+                limit=limit,
+                preferences=preferences
+            )
+            
+            provider_response = ProviderResponse(
+                providers=providers,
+                total_count=len(providers),
+                query=query,
+                state_code=stateCode
+            )
+            cached = response_cache.put(body_key, encoding, provider_response.model_dump_json().encode("utf-8"))
+        
+        body, content_encoding = cached
+        if content_encoding != "identity":
+            headers["Content-Encoding"] = content_encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    except QueryParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error searching providers: {str(e)}")
         return ErrorResponse(
@@ -49,4 +49,13 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
     message: str = Field(..., description="Additional information about the error")
     status_code: int = Field(..., description="Status code")    
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+class RankingPreferences(BaseModel):
+    """Per-request preferences for the optional re-ranking stage."""
+    preferred_language: Optional[str] = Field(None, description="Boost providers who speak this language")
+    preferred_gender: Optional[str] = Field(None, description="Boost providers of this gender")
+    max_cost_efficiency: Optional[int] = Field(None, ge=0, description="Penalize providers above this cost efficiency rating")
+    diversity: float = Field(0.0, ge=0.0, le=1.0, description="Weight of result diversification by city, zip code and specializations")
+    
+    model_config = {"from_attributes": True}
@@ -0,0 +1,154 @@
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from models.provider import Provider
+
+if TYPE_CHECKING:
+    from services.synonyms import SynonymMap
+
+logger = logging.getLogger(__name__)
+
+# Catch-all field holding every token of every searchable field, so an
+# unqualified query term resolves to a single postings lookup.
+ALL_FIELDS = "_all"
+
+# Provider fields indexed for text search; list fields index every entry.
+TEXT_FIELDS = (
+    "name",
+    "gender",
+    "education",
+    "city",
+    "state",
+    "zip_code",
+    "specializations",
+    "known_languages",
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_EMPTY_POSTINGS: FrozenSet[int] = frozenset()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def load_providers(path: str) -> List[Provider]:
+    """
+    Load providers from a JSON file containing a list of provider objects.
+
+    Args:
+        path: Path to the JSON data file
+
+    Returns:
+        List of validated Provider objects
+    """
+    with open(path, "r", encoding="utf-8") as data_file:
+        records = json.load(data_file)
+    return [Provider(**record) for record in records]
+
+
+class ProviderIndex:
+    """In-memory inverted index over provider documents."""
+
+    def __init__(
+        self,
+        providers: Optional[Iterable[Provider]] = None,
+        synonyms: Optional["SynonymMap"] = None
+    ):
+        """
+        Initialize the index, building it from providers if given.
+
+        Args:
+            providers: Providers to index
+            synonyms: Synonym map used to expand specializations and states
+        """
+        self.providers: List[Provider] = []
+        self.synonyms = synonyms
+        self.generation = 0
+        self._postings: Dict[str, Dict[str, FrozenSet[int]]] = {}
+        self._field_values: List[Dict[str, List[List[str]]]] = []
+        self._all_doc_ids: FrozenSet[int] = _EMPTY_POSTINGS
+        self.build(providers or [])
+
+    def __len__(self) -> int:
+        return len(self.providers)
+
+    def build(self, providers: Iterable[Provider]) -> None:
+        """
+        Replace the index contents with the given providers.
+
+        Every rebuild bumps ``generation`` so that anything derived from the
+        index statistics (such as cached query plans) can be invalidated.
+        """
+        self.providers = list(providers)
+        postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in TEXT_FIELDS + (ALL_FIELDS,)}
+        self._field_values = []
+
+        for doc_id, provider in enumerate(self.providers):
+            field_values: Dict[str, List[List[str]]] = {}
+            for field in TEXT_FIELDS:
+                raw_value = getattr(provider, field)
+                values = raw_value if isinstance(raw_value, list) else [raw_value]
+                field_values[field] = [tokenize(str(value)) for value in self._expand(field, values)]
+                for tokens in field_values[field]:
+                    for token in tokens:
+                        postings[field].setdefault(token, set()).add(doc_id)
+                        postings[ALL_FIELDS].setdefault(token, set()).add(doc_id)
+            self._field_values.append(field_values)
+
+        self._postings = {
+            field: {term: frozenset(doc_ids) for term, doc_ids in terms.items()}
+            for field, terms in postings.items()
+        }
+        self._all_doc_ids = frozenset(range(len(self.providers)))
+        self.generation += 1
+        logger.info(f"Indexed {len(self.providers)} providers (generation {self.generation})")
+
+    def _expand(self, field: str, values: List[str]) -> List[str]:
+        """Append configured synonyms and taxonomy categories to field values."""
+        if self.synonyms is None:
+            return values
+        expanded = list(values)
+        for value in values:
+            if field == "specializations":
+                expanded.extend(self.synonyms.expand_specialization(value))
+            elif field == "state":
+                expanded.extend(self.synonyms.expand_state(value))
+        return expanded
+
+    def normalize_state(self, state: str) -> str:
+        """Map a state name to its code using the synonym map, if configured."""
+        if self.synonyms is None:
+            return state
+        return self.synonyms.normalize_state(state)
+
+    def postings(self, field: str, term: str) -> FrozenSet[int]:
+        """Return the document ids containing term in field."""
+        return self._postings.get(field, {}).get(term, _EMPTY_POSTINGS)
+
+    def document_frequency(self, field: str, term: str) -> int:
+        """Return the number of documents containing term in field."""
+        return len(self.postings(field, term))
+
+    def all_doc_ids(self) -> FrozenSet[int]:
+        """Return the ids of every indexed document."""
+        return self._all_doc_ids
+
+    def matches_phrase(self, doc_id: int, field: str, terms: List[str]) -> bool:
+        """
+        Check whether terms appear contiguously within a single value of field.
+
+        Phrases never span two entries of a list field, so "Oral Surgery"
+        does not match ["General Oral", "Surgery"].
+        """
+        fields = TEXT_FIELDS if field == ALL_FIELDS else (field,)
+        width = len(terms)
+        for name in fields:
+            for tokens in self._field_values[doc_id][name]:
+                for start in range(len(tokens) - width + 1):
+                    if tokens[start:start + width] == terms:
+                        return True
+        return False
@@ -2,7 +2,12 @@ from typing import List, Optional
 from datetime import datetime
 import logging
 
-from models.provider import Provider
+from models.provider import Provider, RankingPreferences
+from services.provider_index import tokenize
+from services.query_parser import QueryParseError, normalize_query
+from services.reranker import ProviderReranker
+from services.sharded_index import ShardedProviderIndex
+from services.synonyms import SynonymMap
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,45 +16,122 @@ logger = logging.getLogger(__name__)
 class ProviderService:
     """Service class for managing provider search operations."""
     
-    def __init__(self):
-        """Initialize the provider service."""
+    def __init__(
+        self,
+        providers: Optional[List[Provider]] = None,
+        synonyms: Optional[SynonymMap] = None,
+        plan_cache_size: int = 256,
+        shard_key: str = "state",
+        max_workers: Optional[int] = None,
+        rerank_window: int = 50
+    ):
+        """
+        Initialize the provider service.
+        
+        Args:
+            providers: Providers to index for search; the index starts empty if omitted
+            synonyms: Specialization synonyms, taxonomy and state names applied at index time
+            plan_cache_size: Maximum number of compiled query plans to cache per shard
+            shard_key: Provider field used to partition the index into shards
+            max_workers: Worker thread pool size for running searches off the event loop
+            rerank_window: Number of top results considered by the re-ranking stage
+        """
         self.service_name = "provider-service"
+        self.index = ShardedProviderIndex(
+            shard_key=shard_key,
+            synonyms=synonyms,
+            plan_cache_size=plan_cache_size,
+            max_workers=max_workers
+        )
+        self.index.load(providers or [])
+        self.reranker = ProviderReranker(window=rerank_window)
         logger.info(f"Initialized {self.service_name}")
     
+    def reload_shard(self, shard: str, providers: List[Provider]) -> None:
+        """
+        Replace the providers of a single shard, leaving other shards untouched.
+        
+        Args:
+            shard: Shard key value, e.g. "TX" for the default state sharding
+            providers: Every provider belonging to the shard
+        """
+        self.index.load_shard(shard, providers)
+    
+    def cache_key(
+        self,
+        query: Optional[str] = None,
+        state_code: Optional[str] = None,
+        limit: Optional[int] = None,
+        preferences: Optional[RankingPreferences] = None
+    ) -> str:
+        """
+        Return a key identifying the results of a search.
+        
+        Searches with equivalent normalized parameters share a key. The key
+        includes the index content digest, so it is the same in every process
+        serving the same data and changes when a shard is reloaded with
+        different data.
+        
+        Raises:
+            QueryParseError: If the query cannot be tokenized
+        """
+        state = state_code or ""
+        if state and self.index.synonyms is not None:
+            state = self.index.synonyms.normalize_state(state)
+        return "|".join((
+            self.index.version,
+            normalize_query(query),
+            " ".join(tokenize(state)),
+            str(limit or ""),
+            preferences.model_dump_json() if preferences is not None else ""
+        ))
+    
     async def search_providers(
         self,
         query: Optional[str] = None,
-        state_code: Optional[str] = None
+        state_code: Optional[str] = None,
+        limit: Optional[int] = None,
+        preferences: Optional[RankingPreferences] = None
     ) -> List[Provider]:
         """
         Search providers using the provided filters.
         
+        The query is compiled into a plan whose operators are ordered by
+        posting-list cardinality, so the most selective terms are intersected
+        first. A stateCode filter routes the search to a single state shard;
+        otherwise every shard is searched and the results merged. When
+        preferences are given, the top results are re-ranked by preference
+        and diversity.
+        
         Args:
-            query: Search query for provider name, specialty, or description
-            state_code: State code filter
+            query: Search query in the provider query language, e.g.
+                ``specialty:"Oral Surgery" AND language:spanish NOT city:austin``
+            state_code: State code filter, e.g. "CA" or "California"
+            limit: Maximum number of providers to return; all matches if None
+            preferences: Optional re-ranking preferences
             
         Returns:
-            List of Provider objects matching the search criteria
+            List of Provider objects matching the search criteria, highest reviewed first
+            
+        Raises:
+            QueryParseError: If the query is malformed
         """
         try:
             logger.info(f"Searching providers with query: {query}, state_code: {state_code}")
             
-            # TODO: Implement search logic here
-            # This is intentionally left empty as requested in the instructions
-            
-            # For now, return empty list
-            # In a real implementation, this would:
-            # 1. Connect to database/search engine
-            # 2. Build search query based on parameters
-            # 3. Execute search
-            # 4. Transform results to Provider objects
-            # 5. Return results
-            
-            providers = []
+            if preferences is None:
+                providers = await self.index.search(query=query, state_code=state_code, limit=limit)
+            else:
+                # Retrieve at least a full re-ranking window so the limit is applied after re-ranking.
+                window = None if limit is None else max(limit, self.reranker.window)
+                providers = await self.index.search(query=query, state_code=state_code, limit=window)
+                providers = self.reranker.rerank(providers, preferences)[:limit]
             
             logger.info(f"Found {len(providers)} providers")
             return providers
             
+        except QueryParseError:
+            raise
         except Exception as e:
             logger.error(f"Error searching providers: {e}")
-            raise Exception(f"Failed to search providers: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to search providers: {str(e)}") 
@@ -0,0 +1,295 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from services.provider_index import ALL_FIELDS, tokenize
+
+# Field names accepted in ``field:value`` clauses, mapped to indexed fields.
+FIELD_ALIASES = {
+    "name": "name",
+    "gender": "gender",
+    "education": "education",
+    "city": "city",
+    "state": "state",
+    "statecode": "state",
+    "zip": "zip_code",
+    "zip_code": "zip_code",
+    "zipcode": "zip_code",
+    "specialty": "specializations",
+    "specialization": "specializations",
+    "specializations": "specializations",
+    "language": "known_languages",
+    "languages": "known_languages",
+    "known_languages": "known_languages",
+}
+
+# Boolean operators are only recognised in upper case, so lowercase words
+# such as "and" stay ordinary search terms.
+OPERATORS = ("AND", "OR", "NOT")
+
+# Deepest nesting of parentheses and NOT operators a query may use. The
+# parser and planner recurse once per level, so this keeps hostile queries
+# from exhausting the interpreter stack.
+MAX_QUERY_DEPTH = 32
+
+
+class QueryParseError(ValueError):
+    """Raised when a search query cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class MatchAllNode:
+    """Matches every document (an empty query)."""
+
+
+@dataclass(frozen=True)
+class TermNode:
+    """Matches documents containing a single token in a field."""
+    field: str
+    term: str
+
+
+@dataclass(frozen=True)
+class PhraseNode:
+    """Matches documents containing consecutive tokens in a field."""
+    field: str
+    terms: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AndNode:
+    """Matches documents matched by every child."""
+    children: Tuple["QueryNode", ...]
+
+
+@dataclass(frozen=True)
+class OrNode:
+    """Matches documents matched by any child."""
+    children: Tuple["QueryNode", ...]
+
+
+@dataclass(frozen=True)
+class NotNode:
+    """Matches documents not matched by the child."""
+    child: "QueryNode"
+
+
+QueryNode = Union[MatchAllNode, TermNode, PhraseNode, AndNode, OrNode, NotNode]
+
+# Lexer token kinds
+_LPAREN = "LPAREN"
+_RPAREN = "RPAREN"
+_OPERATOR = "OPERATOR"
+_FIELD = "FIELD"
+_WORD = "WORD"
+_PHRASE = "PHRASE"
+
+Token = Tuple[str, str]
+
+
+def _lex(query: str) -> List[Token]:
+    """Split a raw query string into lexer tokens."""
+    tokens: List[Token] = []
+    position = 0
+    length = len(query)
+
+    while position < length:
+        char = query[position]
+        if char.isspace():
+            position += 1
+        elif char == "(":
+            tokens.append((_LPAREN, char))
+            position += 1
+        elif char == ")":
+            tokens.append((_RPAREN, char))
+            position += 1
+        elif char == '"':
+            end = query.find('"', position + 1)
+            if end == -1:
+                raise QueryParseError("Unterminated quoted phrase in query")
+            tokens.append((_PHRASE, " ".join(tokenize(query[position + 1:end]))))
+            position = end + 1
+        else:
+            end = position
+            while end < length and not query[end].isspace() and query[end] not in '()"':
+                end += 1
+            tokens.extend(_lex_word(query[position:end]))
+            position = end
+
+    return tokens
+
+
+def _lex_word(word: str) -> List[Token]:
+    """Classify a bare word as an operator, field prefix or search term."""
+    if word in OPERATORS:
+        return [(_OPERATOR, word)]
+    if word.startswith("-") and len(word) > 1:
+        return [(_OPERATOR, "NOT")] + _lex_word(word[1:])
+
+    tokens: List[Token] = []
+    if ":" in word:
+        name, _, word = word.partition(":")
+        field = FIELD_ALIASES.get(name.lower())
+        if field is None:
+            known = ", ".join(sorted(FIELD_ALIASES))
+            raise QueryParseError(f"Unknown search field '{name}'. Supported fields: {known}")
+        tokens.append((_FIELD, field))
+
+    terms = tokenize(word)
+    if terms:
+        tokens.append((_WORD, " ".join(terms)))
+    return tokens
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """
+    Return a canonical form of query, suitable as a cache key.
+
+    Queries that differ only in case of search terms, whitespace or field
+    alias spelling normalize to the same string; queries that parse to
+    different trees never do.
+    """
+    if not query:
+        return ""
+
+    parts = []
+    for kind, value in _lex(query):
+        # Multi-token words such as "x-ray" parse as phrases, so they are
+        # written as phrases to keep them distinct from "x ray" (x AND ray).
+        if kind == _PHRASE or (kind == _WORD and " " in value):
+            parts.append(f'"{value}"')
+        elif kind == _FIELD:
+            parts.append(f"{value}:")
+        else:
+            parts.append(value)
+    return " ".join(parts)
+
+
+class _Parser:
+    """
+    Recursive descent parser for the provider query language.
+
+    Grammar (adjacent clauses are implicitly ANDed)::
+
+        query    := or_expr
+        or_expr  := and_expr ("OR" and_expr)*
+        and_expr := not_expr (["AND"] not_expr)*
+        not_expr := "NOT" not_expr | primary
+        primary  := "(" or_expr ")" | [field ":"] (word | "phrase")
+    """
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def parse(self) -> QueryNode:
+        if not self.tokens:
+            return MatchAllNode()
+        node = self._parse_or()
+        if self._peek() is not None:
+            raise QueryParseError(f"Unexpected '{self._peek()[1]}' in query")
+        return node
+
+    def _peek(self) -> Optional[Token]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> Token:
+        token = self._peek()
+        if token is None:
+            raise QueryParseError("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def _at_operator(self, operator: str) -> bool:
+        return self._peek() == (_OPERATOR, operator)
+
+    def _descend(self) -> None:
+        self.depth += 1
+        if self.depth > MAX_QUERY_DEPTH:
+            raise QueryParseError(f"Query is nested too deeply (maximum depth is {MAX_QUERY_DEPTH})")
+
+    def _parse_or(self) -> QueryNode:
+        children = [self._parse_and()]
+        while self._at_operator("OR"):
+            self._next()
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else OrNode(tuple(children))
+
+    def _parse_and(self) -> QueryNode:
+        children = [self._parse_not()]
+        while True:
+            token = self._peek()
+            if token is None or token[0] == _RPAREN or self._at_operator("OR"):
+                break
+            if self._at_operator("AND"):
+                self._next()
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else AndNode(tuple(children))
+
+    def _parse_not(self) -> QueryNode:
+        if self._at_operator("NOT"):
+            self._next()
+            self._descend()
+            node = NotNode(self._parse_not())
+            self.depth -= 1
+            return node
+        return self._parse_primary()
+
+    def _parse_primary(self) -> QueryNode:
+        kind, value = self._next()
+
+        if kind == _LPAREN:
+            self._descend()
+            node = self._parse_or()
+            token = self._peek()
+            if token is None or token[0] != _RPAREN:
+                raise QueryParseError("Missing closing parenthesis in query")
+            self._next()
+            self.depth -= 1
+            return node
+
+        field = ALL_FIELDS
+        if kind == _FIELD:
+            field = value
+            kind, value = self._next()
+            if kind not in (_WORD, _PHRASE):
+                raise QueryParseError(f"Expected a value after '{field}:'")
+
+        if kind in (_WORD, _PHRASE):
+            return _term_node(field, value)
+        raise QueryParseError(f"Unexpected '{value}' in query")
+
+
+def _term_node(field: str, value: str) -> QueryNode:
+    """Build a term node, or a phrase node for multi-token values."""
+    terms = tuple(value.split())
+    if not terms:
+        return MatchAllNode()
+    if len(terms) == 1:
+        return TermNode(field, terms[0])
+    return PhraseNode(field, terms)
+
+
+def parse_query(query: Optional[str]) -> QueryNode:
+    """
+    Parse a search query into a query tree.
+
+    Supports ``field:value`` clauses, quoted phrases, parentheses and the
+    ``AND``/``OR``/``NOT`` operators (``-term`` is shorthand for ``NOT term``).
+
+    Args:
+        query: Raw query string; None or blank matches every provider
+
+    Returns:
+        Root node of the parsed query tree
+
+    Raises:
+        QueryParseError: If the query is malformed, names an unknown field
+            or nests deeper than MAX_QUERY_DEPTH
+    """
+    if not query:
+        return MatchAllNode()
+    return _Parser(_lex(query)).parse()
+
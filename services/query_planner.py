@@ -0,0 +1,234 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import FrozenSet, List, Optional
+
+from services.lru_cache import LRUCache
+from services.provider_index import ProviderIndex, tokenize
+from services.query_parser import (
+    AndNode,
+    MatchAllNode,
+    NotNode,
+    OrNode,
+    PhraseNode,
+    QueryNode,
+    TermNode,
+    normalize_query,
+    parse_query,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PlanNode(ABC):
+    """
+    Executable operator of a compiled query plan.
+
+    ``estimate`` is an upper bound on the number of matching documents,
+    derived from posting-list cardinalities at compile time.
+    """
+
+    estimate: int = 0
+
+    @abstractmethod
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        """Return the ids of the documents matched by this operator."""
+
+    @abstractmethod
+    def explain(self) -> str:
+        """Return a human readable description of the operator tree."""
+
+
+class MatchAllScan(PlanNode):
+    """Scan returning every document in the index."""
+
+    def __init__(self, estimate: int):
+        self.estimate = estimate
+
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        return index.all_doc_ids()
+
+    def explain(self) -> str:
+        return f"MatchAll[{self.estimate}]"
+
+
+class TermScan(PlanNode):
+    """Postings lookup for a single term."""
+
+    def __init__(self, field: str, term: str, estimate: int):
+        self.field = field
+        self.term = term
+        self.estimate = estimate
+
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        return index.postings(self.field, self.term)
+
+    def explain(self) -> str:
+        return f"Term({self.field}:{self.term})[{self.estimate}]"
+
+
+class PhraseScan(PlanNode):
+    """Intersects the postings of a phrase's terms, then verifies adjacency."""
+
+    def __init__(self, field: str, terms: List[str], estimate: int):
+        self.field = field
+        self.terms = terms
+        self.estimate = estimate
+
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        postings = sorted((index.postings(self.field, term) for term in set(self.terms)), key=len)
+        candidates = postings[0]
+        for doc_ids in postings[1:]:
+            if not candidates:
+                break
+            candidates = candidates & doc_ids
+        return frozenset(
+            doc_id for doc_id in candidates
+            if index.matches_phrase(doc_id, self.field, self.terms)
+        )
+
+    def explain(self) -> str:
+        return f'Phrase({self.field}:"{" ".join(self.terms)}")[{self.estimate}]'
+
+
+class Intersect(PlanNode):
+    """
+    Conjunction of operators, evaluated cheapest first.
+
+    Included operators are sorted by ascending estimate so the running
+    result shrinks as early as possible; evaluation stops once it is empty.
+    Negated operators are subtracted afterwards from the (already small)
+    candidate set.
+    """
+
+    def __init__(self, includes: List[PlanNode], excludes: List[PlanNode], universe: int):
+        self.includes = sorted(includes, key=lambda node: node.estimate)
+        self.excludes = sorted(excludes, key=lambda node: node.estimate)
+        self.estimate = self.includes[0].estimate if self.includes else universe
+
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        result: Optional[FrozenSet[int]] = None
+        for node in self.includes:
+            doc_ids = node.execute(index)
+            result = doc_ids if result is None else result & doc_ids
+            if not result:
+                return frozenset()
+        if result is None:
+            result = index.all_doc_ids()
+        for node in self.excludes:
+            result = result - node.execute(index)
+            if not result:
+                break
+        return result
+
+    def explain(self) -> str:
+        parts = [node.explain() for node in self.includes]
+        parts += [f"NOT {node.explain()}" for node in self.excludes]
+        return f"And({', '.join(parts)})[{self.estimate}]"
+
+
+class UnionScan(PlanNode):
+    """Disjunction of operators."""
+
+    def __init__(self, children: List[PlanNode], universe: int):
+        self.children = sorted(children, key=lambda node: node.estimate, reverse=True)
+        self.estimate = min(sum(node.estimate for node in self.children), universe)
+
+    def execute(self, index: ProviderIndex) -> FrozenSet[int]:
+        result: FrozenSet[int] = frozenset()
+        for node in self.children:
+            result = result | node.execute(index)
+        return result
+
+    def explain(self) -> str:
+        return f"Or({', '.join(node.explain() for node in self.children)})[{self.estimate}]"
+
+
+class QueryPlanner:
+    """
+    Compiles parsed queries into cost-ordered plans over a ProviderIndex.
+
+    Plans are cached by normalized query string and state code. Because the
+    operator order depends on the index statistics, the cache is dropped
+    whenever the index generation changes.
+    """
+
+    def __init__(self, index: ProviderIndex, cache_size: int = 256):
+        """Initialize the planner for the given index."""
+        self.index = index
+        self.cache = LRUCache(cache_size)
+        self._generation = index.generation
+
+    def plan(self, query: Optional[str] = None, state_code: Optional[str] = None) -> PlanNode:
+        """
+        Return the execution plan for a query and optional state filter.
+
+        Args:
+            query: Raw query string in the provider query language
+            state_code: State code filter; state names are mapped to codes
+                when the index has a synonym map
+
+        Returns:
+            Root operator of the compiled plan
+
+        Raises:
+            QueryParseError: If the query is malformed
+        """
+        if self._generation != self.index.generation:
+            self.cache.clear()
+            self._generation = self.index.generation
+
+        state_terms = tuple(tokenize(self.index.normalize_state(state_code))) if state_code else ()
+        key = (normalize_query(query), state_terms)
+        plan = self.cache.get(key)
+        if plan is not None:
+            return plan
+
+        node = parse_query(query)
+        if state_terms:
+            state_node = (
+                TermNode("state", state_terms[0]) if len(state_terms) == 1
+                else PhraseNode("state", state_terms)
+            )
+            node = AndNode((state_node, node))
+        plan = self.compile(node)
+        self.cache.put(key, plan)
+        logger.debug(f"Compiled plan for {key}: {plan.explain()}")
+        return plan
+
+    def compile(self, node: QueryNode) -> PlanNode:
+        """Compile a query tree into a plan using current index statistics."""
+        universe = len(self.index)
+
+        if isinstance(node, MatchAllNode):
+            return MatchAllScan(universe)
+        if isinstance(node, TermNode):
+            return TermScan(node.field, node.term, self.index.document_frequency(node.field, node.term))
+        if isinstance(node, PhraseNode):
+            estimate = min(self.index.document_frequency(node.field, term) for term in node.terms)
+            return PhraseScan(node.field, list(node.terms), estimate)
+        if isinstance(node, NotNode):
+            return Intersect([], [self.compile(node.child)], universe)
+        if isinstance(node, OrNode):
+            children = []
+            for child in node.children:
+                compiled = self.compile(child)
+                children.extend(compiled.children if isinstance(compiled, UnionScan) else [compiled])
+            return UnionScan(children, universe)
+        if isinstance(node, AndNode):
+            includes: List[PlanNode] = []
+            excludes: List[PlanNode] = []
+            for child in node.children:
+                if isinstance(child, MatchAllNode):
+                    continue
+                if isinstance(child, NotNode):
+                    excludes.append(self.compile(child.child))
+                    continue
+                compiled = self.compile(child)
+                if isinstance(compiled, Intersect):
+                    includes.extend(compiled.includes)
+                    excludes.extend(compiled.excludes)
+                else:
+                    includes.append(compiled)
+            return Intersect(includes, excludes, universe)
+
+        raise TypeError(f"Unsupported query node: {node!r}")
@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional
+
+from models.provider import Provider, RankingPreferences
+
+# Highest possible reviews rating, used to scale reviews into [0, 1].
+MAX_REVIEWS = 5.0
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class ProviderReranker:
+    """
+    Re-ranks the top of a retrieval result list.
+
+    Relevance is the provider's reviews rating adjusted by the request's
+    preference weights. When diversity is requested, candidates are picked
+    greedily by maximal marginal relevance (MMR): each pick maximizes
+    ``(1 - diversity) * relevance - diversity * max_similarity`` against the
+    providers already picked, where similarity compares city, zip code and
+    specializations.
+
+    Only the first ``window`` candidates are re-ranked and the rest keep
+    their retrieval order, so the cost is bounded by the window size no
+    matter how many providers match.
+    """
+
+    def __init__(
+        self,
+        window: int = 50,
+        language_weight: float = 0.3,
+        gender_weight: float = 0.2,
+        cost_weight: float = 0.5,
+        city_weight: float = 0.3,
+        zip_code_weight: float = 0.4,
+        specialization_weight: float = 0.3
+    ):
+        """
+        Initialize the re-ranker.
+
+        Args:
+            window: Number of top retrieval candidates to re-rank
+            language_weight: Relevance bonus for speaking the preferred language
+            gender_weight: Relevance bonus for matching the preferred gender
+            cost_weight: Relevance penalty for exceeding the cost efficiency ceiling
+            city_weight: Similarity contributed by sharing a city
+            zip_code_weight: Similarity contributed by sharing a zip code
+            specialization_weight: Similarity contributed by specialization overlap (Jaccard)
+        """
+        self.window = window
+        self.language_weight = language_weight
+        self.gender_weight = gender_weight
+        self.cost_weight = cost_weight
+        self.city_weight = city_weight
+        self.zip_code_weight = zip_code_weight
+        self.specialization_weight = specialization_weight
+
+    def rerank(self, providers: List[Provider], preferences: RankingPreferences) -> List[Provider]:
+        """
+        Return providers with the candidate window re-ranked.
+
+        Args:
+            providers: Retrieval results in retrieval order
+            preferences: Per-request preference weights and diversity
+
+        Returns:
+            The re-ranked window followed by the remaining providers
+        """
+        candidates = providers[:self.window]
+        if len(candidates) < 2:
+            return list(providers)
+
+        relevance = self._relevance(candidates, preferences)
+        diversity = preferences.diversity
+        if diversity == 0:
+            order = sorted(range(len(candidates)), key=lambda i: -relevance[i])
+        else:
+            order = self._mmr(candidates, relevance, diversity)
+        return [candidates[i] for i in order] + providers[self.window:]
+
+    def _relevance(self, candidates: List[Provider], preferences: RankingPreferences) -> List[float]:
+        """Score each candidate's reviews and preference matches."""
+        language = (preferences.preferred_language or "").strip().lower()
+        gender = (preferences.preferred_gender or "").strip().lower()
+        ceiling: Optional[int] = preferences.max_cost_efficiency
+
+        scores = []
+        for provider in candidates:
+            score = provider.reviews / MAX_REVIEWS
+            if language and language in (known.lower() for known in provider.known_languages):
+                score += self.language_weight
+            if gender and provider.gender.lower() == gender:
+                score += self.gender_weight
+            if ceiling is not None and provider.cost_efficiency > ceiling:
+                score -= self.cost_weight
+            scores.append(score)
+        return scores
+
+    def _mmr(self, candidates: List[Provider], relevance: List[float], diversity: float) -> List[int]:
+        """
+        Order candidates by maximal marginal relevance.
+
+        Scoring is a plain Python loop over candidate pairs. Cities and zip
+        codes are interned to integers and specializations to bitmasks up
+        front to make each comparison cheap, and each candidate's best
+        similarity to the picked set is updated incrementally. That is
+        O(window^2) work, so the window size is what keeps the cost fixed.
+        """
+        city_ids: Dict[str, int] = {}
+        zip_ids: Dict[str, int] = {}
+        specialization_bits: Dict[str, int] = {}
+        cities, zip_codes, masks, sizes = [], [], [], []
+        for provider in candidates:
+            cities.append(city_ids.setdefault(provider.city.lower(), len(city_ids)))
+            zip_codes.append(zip_ids.setdefault(provider.zip_code, len(zip_ids)))
+            mask = 0
+            for specialization in provider.specializations:
+                mask |= 1 << specialization_bits.setdefault(specialization.lower(), len(specialization_bits))
+            masks.append(mask)
+            sizes.append(_popcount(mask))
+
+        weighted_relevance = [(1 - diversity) * score for score in relevance]
+        max_similarity = [0.0] * len(candidates)
+        remaining = list(range(len(candidates)))
+        order: List[int] = []
+
+        while remaining:
+            best = max(remaining, key=lambda i: (weighted_relevance[i] - diversity * max_similarity[i], -i))
+            order.append(best)
+            remaining.remove(best)
+
+            for i in remaining:
+                similarity = 0.0
+                if cities[i] == cities[best]:
+                    similarity += self.city_weight
+                if zip_codes[i] == zip_codes[best]:
+                    similarity += self.zip_code_weight
+                union = sizes[i] + sizes[best]
+                if union:
+                    shared = _popcount(masks[i] & masks[best])
+                    similarity += self.specialization_weight * shared / (union - shared)
+                if similarity > max_similarity[i]:
+                    max_similarity[i] = similarity
+
+        return order
@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+from typing import Dict, Hashable, Optional, Tuple
+
+from services.lru_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
+
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+
+def make_etag(key: str) -> str:
+    """
+    Return a weak ETag for a response cache key.
+
+    The ETag is weak because responses with the same normalized parameters
+    are semantically equivalent but may echo the raw parameters differently.
+    """
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Return the content codings this server can produce, most preferred first."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Pick the response content coding for an Accept-Encoding header.
+
+    Brotli is preferred over gzip when both are acceptable with the same
+    quality value; ``identity`` is returned when neither is acceptable.
+    """
+    if not accept_encoding:
+        return IDENTITY
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = IDENTITY, 0.0
+    for coding in supported_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded response bodies.
+
+    Bodies are stored per content coding, so a hot query is serialized and
+    compressed once and then served from memory until it is evicted or the
+    index version in its key changes.
+    """
+
+    def __init__(self, maxsize: int = 256, min_compress_size: int = 1024):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize: Maximum number of encoded bodies to keep
+            min_compress_size: Bodies smaller than this many bytes are sent uncompressed
+        """
+        self.min_compress_size = min_compress_size
+        self._bodies = LRUCache(maxsize)
+
+    def get(self, key: Hashable, encoding: str) -> Optional[Tuple[bytes, str]]:
+        """Return the cached (body, content coding) for key and requested coding."""
+        return self._bodies.get((key, encoding))
+
+    def put(self, key: Hashable, encoding: str, body: bytes) -> Tuple[bytes, str]:
+        """
+        Encode body with the requested coding, cache it and return it.
+
+        Returns:
+            The encoded body and the content coding actually applied, which
+            is ``identity`` for bodies below the compression threshold
+        """
+        encoded = self.encode(body, encoding)
+        self._bodies.put((key, encoding), encoded)
+        return encoded
+
+    def encode(self, body: bytes, encoding: str) -> Tuple[bytes, str]:
+        """Compress body with encoding if it is large enough to be worth it."""
+        if len(body) < self.min_compress_size:
+            return body, IDENTITY
+        if encoding == BROTLI and brotli is not None:
+            return brotli.compress(body), BROTLI
+        if encoding == GZIP:
+            return gzip.compress(body, mtime=0), GZIP
+        return body, IDENTITY
+
+    @property
+    def hits(self) -> int:
+        return self._bodies.hits
+
+    @property
+    def misses(self) -> int:
+        return self._bodies.misses
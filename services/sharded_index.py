@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby, islice
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from models.provider import Provider
+from services.provider_index import ProviderIndex, tokenize
+from services.query_parser import parse_query
+from services.query_planner import QueryPlanner
+
+if TYPE_CHECKING:
+    from services.synonyms import SynonymMap
+
+logger = logging.getLogger(__name__)
+
+# Provider fields that can partition the index; list fields cannot.
+SHARDABLE_FIELDS = ("state", "city", "zip_code", "gender", "education", "name")
+
+RankKey = Tuple[float, str, int]
+
+
+class IndexShard:
+    """A ProviderIndex and its QueryPlanner covering one shard key value."""
+
+    def __init__(
+        self,
+        name: str,
+        providers: List[Provider],
+        synonyms: Optional["SynonymMap"] = None,
+        plan_cache_size: int = 256
+    ):
+        self.name = name
+        self.index = ProviderIndex(providers, synonyms=synonyms)
+        self.planner = QueryPlanner(self.index, cache_size=plan_cache_size)
+        digest = hashlib.sha1()
+        for provider in providers:
+            digest.update(provider.model_dump_json().encode("utf-8"))
+            digest.update(b"\n")
+        self.digest = digest.hexdigest()
+
+    def search(
+        self,
+        query: Optional[str],
+        state_code: Optional[str],
+        limit: Optional[int]
+    ) -> List[Tuple[RankKey, Provider]]:
+        """
+        Return this shard's matches as (rank key, provider) pairs in rank order.
+
+        Providers rank by reviews (highest first), then by shard and index order.
+        Only the best ``limit`` matches are returned when a limit is given.
+        """
+        plan = self.planner.plan(query=query, state_code=state_code)
+        providers = self.index.providers
+        ranked = (
+            ((-providers[doc_id].reviews, self.name, doc_id), providers[doc_id])
+            for doc_id in plan.execute(self.index)
+        )
+        if limit is not None:
+            return heapq.nsmallest(limit, ranked, key=lambda item: item[0])
+        return sorted(ranked, key=lambda item: item[0])
+
+
+class ShardedProviderIndex:
+    """
+    Provider index partitioned by a provider field (``state`` by default).
+
+    Each shard is built, cached and replaced independently, so refreshing
+    one state's data leaves every other shard and its plan cache intact.
+    Searches filtered by ``stateCode`` on a state-sharded index touch only
+    that shard; other searches visit every shard and merge the per-shard
+    top results with a heap. All shard work runs on a worker thread pool so
+    it never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        shard_key: str = "state",
+        synonyms: Optional["SynonymMap"] = None,
+        plan_cache_size: int = 256,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize an empty sharded index.
+
+        Args:
+            shard_key: Provider field used to partition providers into shards
+            synonyms: Synonym map applied when indexing each shard
+            plan_cache_size: Plan cache size of each shard
+            max_workers: Worker thread pool size, i.e. how many searches run off the event loop at once
+        """
+        if shard_key not in SHARDABLE_FIELDS:
+            raise ValueError(
+                f"Unsupported shard key '{shard_key}'. Supported keys: {', '.join(SHARDABLE_FIELDS)}"
+            )
+        self.shard_key = shard_key
+        self.synonyms = synonyms
+        self.plan_cache_size = plan_cache_size
+        self.generation = 0
+        self._shards: Dict[str, IndexShard] = {}
+        self._version = self._compute_version()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="index-shard")
+
+    def __len__(self) -> int:
+        return sum(len(shard.index) for shard in self.shards.values())
+
+    @property
+    def version(self) -> str:
+        """
+        Content digest of the current index.
+
+        Derived from every shard's provider data, the shard key and the
+        synonym map, so processes and restarts serving the same data agree
+        on it, while loading different data into any shard changes it.
+        """
+        return self._version
+
+    def _compute_version(self) -> str:
+        digest = hashlib.sha1(self.shard_key.encode("utf-8"))
+        if self.synonyms is not None:
+            digest.update(self.synonyms.digest.encode("utf-8"))
+        for name in sorted(self._shards):
+            digest.update(f"{name}:{self._shards[name].digest}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    @property
+    def shards(self) -> Dict[str, IndexShard]:
+        """Snapshot of the current shards keyed by shard name."""
+        return dict(self._shards)
+
+    def shard_name(self, value: str) -> str:
+        """Return the normalized shard name for a shard key value."""
+        if self.shard_key == "state" and self.synonyms is not None:
+            value = self.synonyms.normalize_state(value)
+        return " ".join(tokenize(str(value)))
+
+    def load(self, providers: Iterable[Provider]) -> None:
+        """Replace every shard with the given providers, grouped by shard key."""
+        by_shard = sorted(
+            ((self.shard_name(getattr(provider, self.shard_key)), provider) for provider in providers),
+            key=lambda item: item[0]
+        )
+        shards = {
+            name: self._build_shard(name, [provider for _, provider in group])
+            for name, group in groupby(by_shard, key=lambda item: item[0])
+        }
+        with self._lock:
+            self._shards = shards
+            self.generation += 1
+            self._version = self._compute_version()
+        logger.info(f"Loaded {len(shards)} shards by {self.shard_key}")
+
+    def load_shard(self, value: str, providers: Iterable[Provider]) -> None:
+        """
+        Build or replace a single shard without touching the others.
+
+        Args:
+            value: Shard key value, e.g. "TX" for a state-sharded index
+            providers: Every provider belonging to the shard
+
+        Raises:
+            ValueError: If a provider belongs to a different shard
+        """
+        name = self.shard_name(value)
+        providers = list(providers)
+        for provider in providers:
+            if self.shard_name(getattr(provider, self.shard_key)) != name:
+                raise ValueError(
+                    f"Provider '{provider.name}' has {self.shard_key} "
+                    f"'{getattr(provider, self.shard_key)}', not '{value}'"
+                )
+        shard = self._build_shard(name, providers)
+        with self._lock:
+            shards = dict(self._shards)
+            shards[name] = shard
+            self._shards = shards
+            self.generation += 1
+            self._version = self._compute_version()
+        logger.info(f"Loaded shard '{name}' with {len(providers)} providers")
+
+    def remove_shard(self, value: str) -> None:
+        """Drop a shard and its providers from the index."""
+        name = self.shard_name(value)
+        with self._lock:
+            shards = dict(self._shards)
+            if shards.pop(name, None) is None:
+                return
+            self._shards = shards
+            self.generation += 1
+            self._version = self._compute_version()
+        logger.info(f"Removed shard '{name}'")
+
+    def _build_shard(self, name: str, providers: List[Provider]) -> IndexShard:
+        return IndexShard(name, providers, synonyms=self.synonyms, plan_cache_size=self.plan_cache_size)
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        state_code: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Provider]:
+        """
+        Search the shards relevant to the request and merge the top results.
+
+        Args:
+            query: Raw query string in the provider query language
+            state_code: State code or name filter
+            limit: Maximum number of providers to return; all matches if None
+
+        Returns:
+            Matching providers, highest reviewed first
+
+        Raises:
+            QueryParseError: If the query is malformed
+        """
+        shards = self._shards
+        if state_code and self.shard_key == "state":
+            shard = shards.get(self.shard_name(state_code))
+            targets = [shard] if shard is not None else []
+            # The shard holds only this state, so no state filter is needed.
+            state_code = None
+        else:
+            targets = list(shards.values())
+
+        if not targets:
+            # Still surface syntax errors when no shard is searched.
+            parse_query(query)
+            return []
+
+        # Shard searches are CPU-bound Python and hold the GIL, so extra
+        # threads would not speed them up; running the whole search on one
+        # worker thread keeps the event loop free for other requests.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._search_shards, targets, query, state_code, limit
+        )
+
+    @staticmethod
+    def _search_shards(
+        targets: List[IndexShard],
+        query: Optional[str],
+        state_code: Optional[str],
+        limit: Optional[int]
+    ) -> List[Provider]:
+        """Search each target shard in turn and heap-merge their ranked results."""
+        shard_results = [shard.search(query, state_code, limit) for shard in targets]
+        merged = heapq.merge(*shard_results, key=lambda item: item[0])
+        if limit is not None:
+            merged = islice(merged, limit)
+        return [provider for _, provider in merged]
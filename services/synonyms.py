@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional
+
+from services.provider_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def _key(value: str) -> str:
+    """Normalize a specialization or state name for lookups."""
+    return " ".join(tokenize(value))
+
+
+class SynonymMap:
+    """
+    Synonyms, specialty taxonomy and state names applied at index time.
+
+    Each indexed specialization is expanded with its synonyms and its
+    broader taxonomy categories (and their synonyms), and each state is
+    indexed under both its code and its full name. Because the expansion
+    happens when documents are indexed, a query for "braces" or "California"
+    is still a single postings lookup.
+    """
+
+    def __init__(
+        self,
+        specializations: Optional[Dict[str, List[str]]] = None,
+        taxonomy: Optional[Dict[str, List[str]]] = None,
+        states: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the synonym map.
+
+        Args:
+            specializations: Canonical specialization mapped to its synonyms
+            taxonomy: Specialization mapped to its broader categories
+            states: State code mapped to state name
+        """
+        self.digest = hashlib.sha1(json.dumps(
+            [specializations or {}, taxonomy or {}, states or {}], sort_keys=True
+        ).encode("utf-8")).hexdigest()
+        self._synonyms: Dict[str, List[str]] = {
+            _key(name): list(synonyms) for name, synonyms in (specializations or {}).items()
+        }
+        self._parents: Dict[str, List[str]] = {
+            _key(name): list(parents) for name, parents in (taxonomy or {}).items()
+        }
+        self._state_codes: Dict[str, str] = {}
+        self._state_names: Dict[str, str] = {}
+        for code, name in (states or {}).items():
+            self._state_codes[_key(code)] = code.upper()
+            self._state_codes[_key(name)] = code.upper()
+            self._state_names[code.upper()] = name
+
+    @classmethod
+    def from_file(cls, path: str) -> "SynonymMap":
+        """
+        Load a synonym map from a JSON file.
+
+        The file may contain ``specializations``, ``taxonomy`` and ``states``
+        objects; see ``synonyms.json`` for the format.
+        """
+        with open(path, "r", encoding="utf-8") as synonyms_file:
+            config = json.load(synonyms_file)
+        synonym_map = cls(
+            specializations=config.get("specializations"),
+            taxonomy=config.get("taxonomy"),
+            states=config.get("states")
+        )
+        logger.info(
+            f"Loaded {len(synonym_map._synonyms)} specialization synonym sets "
+            f"and {len(synonym_map._state_names)} states from {path}"
+        )
+        return synonym_map
+
+    def expand_specialization(self, specialization: str) -> List[str]:
+        """
+        Return the extra values to index alongside a specialization.
+
+        Includes the specialization's synonyms and every broader taxonomy
+        category reachable from it, together with their synonyms.
+        """
+        expansions: List[str] = []
+        seen = {_key(specialization)}
+        pending = [specialization]
+        while pending:
+            current = _key(pending.pop())
+            expansions.extend(self._synonyms.get(current, []))
+            for parent in self._parents.get(current, []):
+                if _key(parent) not in seen:
+                    seen.add(_key(parent))
+                    expansions.append(parent)
+                    pending.append(parent)
+        return expansions
+
+    def normalize_state(self, state: str) -> str:
+        """Return the state code for a state code or name, or state unchanged if unknown."""
+        return self._state_codes.get(_key(state), state)
+
+    def expand_state(self, state: str) -> List[str]:
+        """Return the extra values to index alongside a state code or name."""
+        code = self._state_codes.get(_key(state))
+        if code is None:
+            return []
+        return [value for value in (code, self._state_names[code]) if _key(value) != _key(state)]
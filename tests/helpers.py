@@ -0,0 +1,29 @@
+from models.provider import Provider
+
+def make_provider(
+    name="Dr. Test",
+    gender="Female",
+    education="DDS",
+    reviews=4.0,
+    city="Springfield",
+    state="CA",
+    zip_code="00000",
+    specializations=None,
+    year_of_experience=10,
+    known_languages=None,
+    cost_efficiency=3
+):
+    """Build a valid Provider, overriding only the fields a test cares about."""
+    return Provider(
+        name=name,
+        gender=gender,
+        education=education,
+        reviews=reviews,
+        city=city,
+        state=state,
+        zip_code=zip_code,
+        specializations=specializations or ["General Dentistry"],
+        year_of_experience=year_of_experience,
+        known_languages=known_languages or ["English"],
+        cost_efficiency=cost_efficiency
+    )
@@ -1,6 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
+import main
 from main import app
+from models.provider import Provider
+from services.provider_service import ProviderService
+from services.synonyms import SynonymMap
 
 client = TestClient(app)
 
@@ -91,6 +95,90 @@ class TestProvidersEndpoint:
         assert data["state_code"] == ""
         assert "providers" in data
 
+class TestProvidersHTTPCaching:
+    """Test cases for ETag, Cache-Control and compression on /providers."""
+    
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Install a service with enough providers to exceed the compression threshold."""
+        example = Provider.model_config["json_schema_extra"]["example"]
+        service = ProviderService(
+            providers=[Provider(**example) for _ in range(20)],
+            synonyms=SynonymMap.from_file(main.SYNONYMS_PATH)
+        )
+        monkeypatch.setattr(main, "provider_service", service)
+        return service
+    
+    def test_cache_headers(self, service):
+        """Test that responses carry ETag, Cache-Control and Vary headers."""
+        response = client.get("/providers?query=cardiology")
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == main.CACHE_CONTROL
+        assert response.headers["vary"] == "Accept-Encoding"
+    
+    def test_etag_uses_normalized_parameters(self, service):
+        """Test that equivalent queries share an ETag."""
+        first = client.get("/providers?query=Cardiology&stateCode=ca")
+        second = client.get("/providers?query=cardiology&stateCode=California")
+        assert first.headers["etag"] == second.headers["etag"]
+        assert second.json()["query"] == "cardiology"
+    
+    def test_if_none_match_returns_304(self, service):
+        """Test conditional requests with a current ETag."""
+        etag = client.get("/providers").headers["etag"]
+        
+        response = client.get("/providers", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    
+    def test_etag_changes_when_shard_reloaded(self, service):
+        """Test that reloading a shard with different data invalidates ETags."""
+        etag = client.get("/providers").headers["etag"]
+        california = list(service.index.shards["ca"].index.providers)
+        
+        service.reload_shard("California", california)
+        assert client.get("/providers").headers["etag"] == etag
+        
+        service.reload_shard("California", california[:-1])
+        response = client.get("/providers", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_etag_stable_across_service_instances(self, service, monkeypatch):
+        """Test that services built from the same data (e.g. other workers) agree on ETags."""
+        etag = client.get("/providers?query=english").headers["etag"]
+        
+        example = Provider.model_config["json_schema_extra"]["example"]
+        other = ProviderService(
+            providers=[Provider(**example) for _ in range(20)],
+            synonyms=SynonymMap.from_file(main.SYNONYMS_PATH)
+        )
+        monkeypatch.setattr(main, "provider_service", other)
+        
+        response = client.get("/providers?query=english", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    
+    def test_gzip_compression(self, service):
+        """Test that large responses are gzip compressed when accepted."""
+        response = client.get("/providers", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["total_count"] == 20
+    
+    def test_no_compression_without_accept_encoding(self, service):
+        """Test that responses are uncompressed when no coding is accepted."""
+        response = client.get("/providers", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json()["total_count"] == 20
+    
+    def test_compressed_body_cached(self, service):
+        """Test that repeated hot queries reuse the encoded body."""
+        hits = main.response_cache.hits
+        client.get("/providers?query=english", headers={"Accept-Encoding": "gzip"})
+        client.get("/providers?query=english", headers={"Accept-Encoding": "gzip"})
+        assert main.response_cache.hits == hits + 1
+
 class TestProviderResponseModel:
     """Test cases for the ProviderResponse model."""
     
@@ -123,6 +211,54 @@ class TestAPIErrorHandling:
         response = client.post("/providers")
         assert response.status_code == 405
     
+    def test_fetch_providers_with_limit(self, monkeypatch):
+        """Test that limit caps the number of providers returned."""
+        provider = Provider(**Provider.model_config["json_schema_extra"]["example"])
+        monkeypatch.setattr(main, "provider_service", ProviderService(providers=[provider] * 3))
+        
+        response = client.get("/providers?limit=2")
+        assert response.status_code == 200
+        assert response.json()["total_count"] == 2
+    
+    def test_fetch_providers_with_preferences(self, monkeypatch):
+        """Test that preference parameters re-rank the results."""
+        example = Provider.model_config["json_schema_extra"]["example"]
+        providers = [
+            Provider(**{**example, "name": "top", "reviews": 4.9, "known_languages": ["English"]}),
+            Provider(**{**example, "name": "spanish", "reviews": 4.5}),
+        ]
+        monkeypatch.setattr(main, "provider_service", ProviderService(providers=providers))
+        
+        plain = client.get("/providers")
+        preferred = client.get("/providers?preferredLanguage=Spanish&diversity=0.2")
+        assert [p["name"] for p in plain.json()["providers"]] == ["top", "spanish"]
+        assert [p["name"] for p in preferred.json()["providers"]] == ["spanish", "top"]
+        assert plain.headers["etag"] != preferred.headers["etag"]
+    
+    def test_invalid_diversity_returns_422(self):
+        """Test that out of range diversity values are rejected."""
+        response = client.get("/providers?diversity=2")
+        assert response.status_code == 422
+    
+    def test_invalid_limit_returns_422(self):
+        """Test that non-positive limits are rejected."""
+        response = client.get("/providers?limit=0")
+        assert response.status_code == 422
+    
+    def test_malformed_query_returns_400(self):
+        """Test that malformed search queries are rejected with 400."""
+        response = client.get('/providers?query="unterminated')
+        assert response.status_code == 400
+        assert "detail" in response.json()
+    
+    def test_deeply_nested_query_returns_400(self):
+        """Test that queries nested past the parser's depth limit are rejected with 400."""
+        response = client.get("/providers", params={"query": "(" * 300 + "a" + ")" * 300})
+        assert response.status_code == 400
+        
+        response = client.get("/providers", params={"query": "NOT " * 400 + "a"})
+        assert response.status_code == 400
+    
     def test_invalid_method_health(self):
         """Test that invalid HTTP methods on health endpoint return 405."""
         response = client.post("/health")
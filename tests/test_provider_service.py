@@ -1,5 +1,10 @@
+import os
 import pytest
+from services.provider_index import load_providers
 from services.provider_service import ProviderService
+from services.query_parser import QueryParseError
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "provider_data.json")
 
 class TestProviderService:
     """Test cases for the ProviderService class."""
@@ -66,6 +71,70 @@ class TestProviderService:
         assert isinstance(providers, list)
         # Should handle empty strings gracefully
 
+class TestProviderServiceSearch:
+    """Test cases for searching an indexed provider data set."""
+    
+    @pytest.fixture(scope="class")
+    def provider_service(self):
+        """Fixture to create a ProviderService over provider_data.json."""
+        return ProviderService(providers=load_providers(DATA_PATH))
+    
+    @pytest.mark.asyncio
+    async def test_search_all_providers(self, provider_service):
+        """Test that an empty search returns every indexed provider."""
+        providers = await provider_service.search_providers()
+        
+        assert len(providers) == len(provider_service.index)
+    
+    @pytest.mark.asyncio
+    async def test_search_by_state_code(self, provider_service):
+        """Test that stateCode filters providers by state, case-insensitively."""
+        providers = await provider_service.search_providers(state_code="ny")
+        
+        assert providers
+        assert all(provider.state == "NY" for provider in providers)
+    
+    @pytest.mark.asyncio
+    async def test_search_with_query_language(self, provider_service):
+        """Test field, phrase and negation clauses combined with stateCode."""
+        providers = await provider_service.search_providers(
+            query='specialty:"Oral Surgery" NOT language:spanish',
+            state_code="CA"
+        )
+        
+        assert providers
+        for provider in providers:
+            assert provider.state == "CA"
+            assert "Oral Surgery" in provider.specializations
+            assert "Spanish" not in provider.known_languages
+    
+    @pytest.mark.asyncio
+    async def test_search_with_limit(self, provider_service):
+        """Test that limit returns the highest reviewed matches."""
+        providers = await provider_service.search_providers(query="spanish", limit=3)
+        all_matches = await provider_service.search_providers(query="spanish")
+        
+        assert providers == all_matches[:3]
+        assert [p.reviews for p in all_matches] == sorted((p.reviews for p in all_matches), reverse=True)
+    
+    @pytest.mark.asyncio
+    async def test_reload_shard(self):
+        """Test that a single state can be refreshed independently."""
+        providers = load_providers(DATA_PATH)
+        service = ProviderService(providers=providers)
+        texas = [provider for provider in providers if provider.state == "TX"][:2]
+        
+        service.reload_shard("TX", texas)
+        
+        assert len(await service.search_providers(state_code="TX")) == 2
+        assert len(await service.search_providers(state_code="CA")) == 30
+    
+    @pytest.mark.asyncio
+    async def test_search_with_invalid_query(self, provider_service):
+        """Test that malformed queries raise QueryParseError."""
+        with pytest.raises(QueryParseError):
+            await provider_service.search_providers(query="(pediatric")
+
 class TestProviderServiceInitialization:
     """Test cases for ProviderService initialization."""
     
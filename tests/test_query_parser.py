@@ -0,0 +1,115 @@
+import pytest
+from services.provider_index import ALL_FIELDS
+from services.query_parser import (
+    AndNode,
+    MAX_QUERY_DEPTH,
+    MatchAllNode,
+    NotNode,
+    OrNode,
+    PhraseNode,
+    QueryParseError,
+    TermNode,
+    normalize_query,
+    parse_query,
+)
+
+class TestParseQuery:
+    """Test cases for the query language parser."""
+    
+    def test_empty_query_matches_all(self):
+        """Test that None and blank queries match every provider."""
+        assert parse_query(None) == MatchAllNode()
+        assert parse_query("") == MatchAllNode()
+        assert parse_query("   ") == MatchAllNode()
+    
+    def test_bare_term_searches_all_fields(self):
+        """Test that an unqualified word becomes a lowercase term on all fields."""
+        assert parse_query("Cardiology") == TermNode(ALL_FIELDS, "cardiology")
+    
+    def test_field_term_resolves_alias(self):
+        """Test that field aliases map to indexed provider fields."""
+        assert parse_query("specialty:orthodontics") == TermNode("specializations", "orthodontics")
+        assert parse_query("language:Spanish") == TermNode("known_languages", "spanish")
+    
+    def test_quoted_phrase(self):
+        """Test that quoted text becomes a phrase node."""
+        assert parse_query('specialty:"Oral Surgery"') == PhraseNode("specializations", ("oral", "surgery"))
+    
+    def test_implicit_and(self):
+        """Test that adjacent clauses are combined with AND."""
+        assert parse_query("spanish dds") == AndNode(
+            (TermNode(ALL_FIELDS, "spanish"), TermNode(ALL_FIELDS, "dds"))
+        )
+    
+    def test_operator_precedence(self):
+        """Test that AND binds tighter than OR."""
+        assert parse_query("a OR b AND c") == OrNode(
+            (TermNode(ALL_FIELDS, "a"), AndNode((TermNode(ALL_FIELDS, "b"), TermNode(ALL_FIELDS, "c"))))
+        )
+    
+    def test_parentheses_and_negation(self):
+        """Test grouping and both NOT spellings."""
+        expected = AndNode((
+            OrNode((TermNode(ALL_FIELDS, "a"), TermNode(ALL_FIELDS, "b"))),
+            NotNode(TermNode("city", "austin")),
+        ))
+        assert parse_query("(a OR b) NOT city:austin") == expected
+        assert parse_query("(a OR b) -city:austin") == expected
+    
+    def test_lowercase_operators_are_terms(self):
+        """Test that lowercase operator words are treated as search terms."""
+        assert parse_query("or") == TermNode(ALL_FIELDS, "or")
+    
+    @pytest.mark.parametrize("query", [
+        'specialty:"oral surgery',
+        "(a OR b",
+        "a OR",
+        "NOT",
+        "a )",
+        "unknown:value",
+    ])
+    def test_malformed_queries_raise(self, query):
+        """Test that malformed queries raise QueryParseError."""
+        with pytest.raises(QueryParseError):
+            parse_query(query)
+    
+    def test_deeply_nested_parentheses_raise(self):
+        """Test that excessive parenthesis nesting is a parse error, not a RecursionError."""
+        with pytest.raises(QueryParseError, match="nested too deeply"):
+            parse_query("(" * 300 + "a" + ")" * 300)
+    
+    def test_repeated_not_raises(self):
+        """Test that a long chain of NOT operators is a parse error, not a RecursionError."""
+        with pytest.raises(QueryParseError, match="nested too deeply"):
+            parse_query("NOT " * 400 + "a")
+    
+    def test_nesting_within_limit_parses(self):
+        """Test that nesting up to MAX_QUERY_DEPTH is still accepted."""
+        depth = MAX_QUERY_DEPTH // 2
+        assert parse_query("(" * depth + "a" + ")" * depth) == TermNode(ALL_FIELDS, "a")
+        assert isinstance(parse_query("(NOT " * depth + "a" + ")" * depth), NotNode)
+
+class TestNormalizeQuery:
+    """Test cases for query normalization used as the plan cache key."""
+    
+    def test_equivalent_queries_normalize_identically(self):
+        """Test that case, whitespace and alias differences are normalized away."""
+        assert normalize_query("  Specialty:ORAL   AND  Spanish ") == normalize_query("specialization: oral AND spanish")
+    
+    def test_hyphenated_words_normalize_as_phrases(self):
+        """Test that multi-token words keep their phrase meaning after normalization."""
+        assert normalize_query("surgery-dental") == normalize_query('"surgery dental"')
+        assert normalize_query("surgery-dental") != normalize_query("surgery dental")
+        assert normalize_query("name:foo-bar") != normalize_query("name:foo bar")
+    
+    def test_operators_are_preserved(self):
+        """Test that operators remain distinct from terms after normalization."""
+        assert normalize_query("a OR b") != normalize_query("a or b")
+    
+    def test_empty_query(self):
+        """Test that empty queries normalize to an empty string."""
+        assert normalize_query(None) == ""
+        assert normalize_query("") == ""
+
+if __name__ == "__main__":
+    pytest.main([__file__])
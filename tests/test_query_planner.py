@@ -0,0 +1,100 @@
+import pytest
+from tests.helpers import make_provider
+from services.provider_index import ProviderIndex
+from services.query_planner import Intersect, QueryPlanner, TermScan
+
+@pytest.fixture
+def index():
+    """Index where 'english' is common and the TX state is rare."""
+    providers = [
+        make_provider(f"ca{i}", state="CA") for i in range(8)
+    ] + [
+        make_provider("tx0", state="TX", specializations=["Oral Surgery"], known_languages=["English", "Spanish"]),
+        make_provider("tx1", state="TX", specializations=["General Dentistry", "Oral Surgery"], known_languages=["English"]),
+    ]
+    return ProviderIndex(providers)
+
+class TestQueryPlanner:
+    """Test cases for cost-based plan compilation and caching."""
+    
+    def test_intersection_ordered_by_cardinality(self, index):
+        """Test that the rarest operator is evaluated first."""
+        plan = QueryPlanner(index).plan(query="english", state_code="TX")
+        
+        assert isinstance(plan, Intersect)
+        estimates = [node.estimate for node in plan.includes]
+        assert estimates == sorted(estimates)
+        assert isinstance(plan.includes[0], TermScan)
+        assert plan.includes[0].field == "state"
+    
+    def test_plan_execution(self, index):
+        """Test that compiled plans return the matching documents."""
+        planner = QueryPlanner(index)
+        
+        def names(query, state_code=None):
+            doc_ids = planner.plan(query=query, state_code=state_code).execute(index)
+            return sorted(index.providers[doc_id].name for doc_id in doc_ids)
+        
+        assert names('specialty:"oral surgery"') == ["tx0", "tx1"]
+        assert names("spanish OR tx1") == ["tx0", "tx1"]
+        assert names("english -spanish", "TX") == ["tx1"]
+        assert names("NOT english") == []
+        assert names(None) == sorted(p.name for p in index.providers)
+    
+    def test_phrase_requires_adjacent_terms(self, index):
+        """Test that phrase terms must appear together in a single value."""
+        planner = QueryPlanner(index)
+        
+        assert planner.plan(query='"dentistry oral"').execute(index) == frozenset()
+    
+    def test_plans_cached_by_normalized_query(self, index):
+        """Test that equivalent queries share a cached plan."""
+        planner = QueryPlanner(index)
+        
+        first = planner.plan(query="Specialty:Oral", state_code="tx")
+        second = planner.plan(query="  specialization:oral ", state_code="TX")
+        
+        assert first is second
+        assert planner.cache.hits == 1
+        assert planner.cache.misses == 1
+    
+    def test_hyphenated_word_does_not_share_cached_plan(self, index):
+        """Test that a hyphenated word (a phrase) and separate words cache separately."""
+        planner = QueryPlanner(index)
+        
+        def names(query):
+            doc_ids = planner.plan(query=query).execute(index)
+            return sorted(index.providers[doc_id].name for doc_id in doc_ids)
+        
+        assert names("dentistry-oral") == []
+        assert names("dentistry oral") == ["tx1"]
+        assert names("name:tx-0") == []
+        assert names("name:tx 0") == []
+        assert planner.cache.hits == 0
+    
+    def test_cache_invalidated_on_rebuild(self, index):
+        """Test that rebuilding the index drops plans compiled on old statistics."""
+        planner = QueryPlanner(index)
+        first = planner.plan(query="english")
+        
+        index.build(index.providers[:2])
+        second = planner.plan(query="english")
+        
+        assert first is not second
+        assert second.estimate == 2
+    
+    def test_cache_evicts_least_recently_used(self, index):
+        """Test that the plan cache is bounded."""
+        planner = QueryPlanner(index, cache_size=2)
+        
+        planner.plan(query="a")
+        planner.plan(query="b")
+        planner.plan(query="a")
+        planner.plan(query="c")
+        
+        assert len(planner.cache) == 2
+        planner.plan(query="a")
+        assert planner.cache.hits == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,64 @@
+import pytest
+from tests.helpers import make_provider
+from models.provider import RankingPreferences
+from services.reranker import ProviderReranker
+
+def names(providers):
+    return [provider.name for provider in providers]
+
+class TestProviderReranker:
+    """Test cases for preference re-ranking and MMR diversification."""
+    
+    def test_no_preferences_keeps_order(self):
+        """Test that neutral preferences keep the reviews order."""
+        providers = [make_provider("a", reviews=4.9), make_provider("b", reviews=4.5), make_provider("c", reviews=4.0)]
+        
+        assert names(ProviderReranker().rerank(providers, RankingPreferences())) == ["a", "b", "c"]
+    
+    def test_preferred_language_and_gender_boost(self):
+        """Test that preference matches outrank slightly better reviews."""
+        providers = [
+            make_provider("english", reviews=4.9),
+            make_provider("spanish", reviews=4.6, known_languages=["English", "Spanish"]),
+            make_provider("male", reviews=4.7, gender="Male"),
+        ]
+        preferences = RankingPreferences(preferred_language="spanish", preferred_gender="male")
+        
+        assert names(ProviderReranker().rerank(providers, preferences)) == ["spanish", "male", "english"]
+    
+    def test_cost_efficiency_ceiling_penalty(self):
+        """Test that providers above the cost ceiling drop below those within it."""
+        providers = [make_provider("pricey", reviews=4.9, cost_efficiency=5), make_provider("cheap", reviews=4.2, cost_efficiency=1)]
+        preferences = RankingPreferences(max_cost_efficiency=2)
+        
+        assert names(ProviderReranker().rerank(providers, preferences)) == ["cheap", "pricey"]
+    
+    def test_diversity_spreads_zip_codes(self):
+        """Test that MMR interleaves providers from different zip codes and cities."""
+        providers = [
+            make_provider("ny1", reviews=4.9),
+            make_provider("ny2", reviews=4.8),
+            make_provider("ny3", reviews=4.7),
+            make_provider("bk1", reviews=4.6, zip_code="11201", city="Brooklyn", specializations=["Orthodontics"]),
+        ]
+        preferences = RankingPreferences(diversity=0.5)
+        
+        assert names(ProviderReranker().rerank(providers, preferences)) == ["ny1", "bk1", "ny2", "ny3"]
+    
+    def test_only_window_is_reranked(self):
+        """Test that candidates beyond the window keep their retrieval order."""
+        providers = [make_provider(f"p{i}", reviews=4.0) for i in range(5)]
+        providers[4] = make_provider("p4", reviews=4.0, known_languages=["Spanish"])
+        preferences = RankingPreferences(preferred_language="spanish")
+        
+        reranked = ProviderReranker(window=3).rerank(providers, preferences)
+        
+        assert names(reranked) == ["p0", "p1", "p2", "p3", "p4"]
+    
+    def test_invalid_diversity_rejected(self):
+        """Test that diversity is bounded to [0, 1]."""
+        with pytest.raises(ValueError):
+            RankingPreferences(diversity=1.5)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+import gzip
+import pytest
+from services import response_cache as response_cache_module
+from services.response_cache import (
+    ResponseCache,
+    etag_matches,
+    make_etag,
+    negotiate_encoding,
+)
+
+class TestETags:
+    """Test cases for ETag generation and If-None-Match comparison."""
+    
+    def test_etag_is_weak_and_deterministic(self):
+        """Test that equal keys produce the same weak ETag."""
+        etag = make_etag("1|cardiology|ca|")
+        
+        assert etag.startswith('W/"')
+        assert etag == make_etag("1|cardiology|ca|")
+        assert etag != make_etag("2|cardiology|ca|")
+    
+    def test_etag_matches(self):
+        """Test weak comparison, lists and wildcards in If-None-Match."""
+        etag = make_etag("key")
+        
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag[2:], etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+    
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        """Test that brotli wins over gzip at equal quality."""
+        monkeypatch.setattr(response_cache_module, "brotli", object())
+        
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+    
+    def test_falls_back_to_gzip_without_brotli(self, monkeypatch):
+        """Test that brotli is not offered when the package is missing."""
+        monkeypatch.setattr(response_cache_module, "brotli", None)
+        
+        assert negotiate_encoding("br, gzip") == "gzip"
+        assert negotiate_encoding("br") == "identity"
+    
+    def test_identity_when_nothing_acceptable(self):
+        """Test missing, refused and wildcard encodings."""
+        assert negotiate_encoding(None) == "identity"
+        assert negotiate_encoding("gzip;q=0, br;q=0") == "identity"
+        assert negotiate_encoding("*") in ("br", "gzip")
+
+class TestResponseCache:
+    """Test cases for caching encoded response bodies."""
+    
+    def test_small_bodies_not_compressed(self):
+        """Test that bodies below the threshold are sent as-is."""
+        cache = ResponseCache(min_compress_size=100)
+        
+        assert cache.put("key", "gzip", b"{}") == (b"{}", "identity")
+    
+    def test_large_bodies_compressed_and_cached(self):
+        """Test that compressed bodies are stored and reused."""
+        cache = ResponseCache(min_compress_size=100)
+        body = b'{"providers": []}' * 20
+        
+        encoded, encoding = cache.put("key", "gzip", body)
+        
+        assert encoding == "gzip"
+        assert gzip.decompress(encoded) == body
+        assert cache.get("key", "gzip") == (encoded, "gzip")
+        assert cache.get("key", "identity") is None
+        assert cache.hits == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,137 @@
+import threading
+import pytest
+from tests.helpers import make_provider
+from services.query_parser import QueryParseError
+from services.sharded_index import IndexShard, ShardedProviderIndex
+from services.synonyms import SynonymMap
+
+@pytest.fixture
+def index():
+    """State-sharded index over three states."""
+    sharded = ShardedProviderIndex(synonyms=SynonymMap(states={"CA": "California", "TX": "Texas"}))
+    sharded.load([
+        make_provider("ca-low", state="CA", reviews=3.0),
+        make_provider("tx-high", state="TX", reviews=4.9),
+        make_provider("ca-high", state="CA", reviews=4.7),
+        make_provider("ny-mid", state="NY", reviews=4.0),
+        make_provider("tx-low", state="TX", reviews=2.5),
+    ])
+    return sharded
+
+def names(providers):
+    return [provider.name for provider in providers]
+
+class TestShardedProviderIndex:
+    """Test cases for state sharding, routing and fan-out."""
+    
+    def test_providers_partitioned_by_state(self, index):
+        """Test that each state gets its own shard."""
+        assert sorted(index.shards) == ["ca", "ny", "tx"]
+        assert len(index) == 5
+    
+    @pytest.mark.asyncio
+    async def test_state_code_routes_to_single_shard(self, index):
+        """Test that a stateCode search only plans against its shard."""
+        providers = await index.search(query="dentistry", state_code="California")
+        
+        assert names(providers) == ["ca-high", "ca-low"]
+        assert index.shards["ca"].planner.cache.misses == 1
+        assert index.shards["tx"].planner.cache.misses == 0
+        assert index.shards["ny"].planner.cache.misses == 0
+    
+    @pytest.mark.asyncio
+    async def test_searches_run_off_event_loop(self, index, monkeypatch):
+        """Test that routed and multi-shard searches both run on a worker thread."""
+        threads = []
+        original_search = IndexShard.search
+        
+        def recording_search(shard, *args):
+            threads.append(threading.current_thread())
+            return original_search(shard, *args)
+        
+        monkeypatch.setattr(IndexShard, "search", recording_search)
+        await index.search(state_code="CA")
+        await index.search(query="english")
+        
+        assert len(threads) == 4
+        assert threading.main_thread() not in threads
+    
+    @pytest.mark.asyncio
+    async def test_unknown_state_returns_no_providers(self, index):
+        """Test that a stateCode without a shard matches nothing."""
+        assert await index.search(state_code="WA") == []
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_merges_in_rank_order(self, index):
+        """Test that fan-out results are merged by reviews across shards."""
+        providers = await index.search(query="english")
+        
+        assert names(providers) == ["tx-high", "ca-high", "ny-mid", "ca-low", "tx-low"]
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_top_k(self, index):
+        """Test that only the top results are returned when limited."""
+        providers = await index.search(limit=2)
+        
+        assert names(providers) == ["tx-high", "ca-high"]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_query_raises_without_shards(self):
+        """Test that syntax errors surface even when no shard is searched."""
+        with pytest.raises(QueryParseError):
+            await ShardedProviderIndex().search(query="(unclosed")
+    
+    @pytest.mark.asyncio
+    async def test_reload_shard_leaves_other_shards(self, index):
+        """Test that reloading one shard does not rebuild the others."""
+        ca_shard = index.shards["ca"]
+        generation = index.generation
+        
+        index.load_shard("Texas", [make_provider("tx-new", state="TX", reviews=4.1)])
+        
+        assert index.shards["ca"] is ca_shard
+        assert index.generation == generation + 1
+        assert names(await index.search(state_code="TX")) == ["tx-new"]
+    
+    def test_version_derived_from_content(self, index):
+        """Test that the version depends only on the indexed data."""
+        other = ShardedProviderIndex(synonyms=SynonymMap(states={"CA": "California", "TX": "Texas"}))
+        other.load(provider for shard in index.shards.values() for provider in shard.index.providers)
+        assert other.version == index.version
+        
+        version = index.version
+        index.load_shard("NY", [make_provider("ny-new", state="NY", reviews=3.5)])
+        assert index.version != version
+    
+    def test_load_shard_rejects_foreign_providers(self, index):
+        """Test that a shard only accepts providers with its key value."""
+        with pytest.raises(ValueError):
+            index.load_shard("TX", [make_provider("ca-new", state="CA", reviews=4.0)])
+    
+    def test_remove_shard(self, index):
+        """Test that removing a shard drops its providers."""
+        index.remove_shard("NY")
+        
+        assert "ny" not in index.shards
+        assert len(index) == 4
+    
+    @pytest.mark.asyncio
+    async def test_custom_shard_key(self):
+        """Test sharding by another field while filtering by stateCode."""
+        sharded = ShardedProviderIndex(shard_key="city")
+        sharded.load([
+            make_provider("austin", state="TX", reviews=4.0, city="Austin"),
+            make_provider("dallas", state="TX", reviews=4.5, city="Dallas"),
+            make_provider("la", state="CA", reviews=5.0, city="Los Angeles"),
+        ])
+        
+        assert sorted(sharded.shards) == ["austin", "dallas", "los angeles"]
+        assert names(await sharded.search(state_code="TX")) == ["dallas", "austin"]
+    
+    def test_unsupported_shard_key(self):
+        """Test that list fields cannot be used as shard keys."""
+        with pytest.raises(ValueError):
+            ShardedProviderIndex(shard_key="specializations")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+import os
+import pytest
+from tests.helpers import make_provider
+from services.provider_index import ProviderIndex
+from services.query_planner import QueryPlanner
+from services.synonyms import SynonymMap
+
+SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "synonyms.json")
+
+@pytest.fixture
+def synonyms():
+    """Small synonym map with a two-level taxonomy."""
+    return SynonymMap(
+        specializations={
+            "Orthodontics": ["braces", "orthodontist"],
+            "Pediatric Dentistry": ["kids dentist"],
+            "Dentistry": ["dentist"],
+        },
+        taxonomy={
+            "Orthodontics": ["Dentistry"],
+            "Pediatric Dentistry": ["Dentistry"],
+        },
+        states={"CA": "California", "NY": "New York"}
+    )
+
+class TestSynonymMap:
+    """Test cases for synonym, taxonomy and state expansion."""
+    
+    def test_expand_specialization_includes_synonyms_and_taxonomy(self, synonyms):
+        """Test that synonyms and broader categories (with their synonyms) are returned."""
+        assert synonyms.expand_specialization("orthodontics") == ["braces", "orthodontist", "Dentistry", "dentist"]
+    
+    def test_expand_unknown_specialization(self, synonyms):
+        """Test that unknown specializations expand to nothing."""
+        assert synonyms.expand_specialization("Cardiology") == []
+    
+    def test_taxonomy_cycles_terminate(self):
+        """Test that cyclic taxonomies do not loop forever."""
+        synonym_map = SynonymMap(taxonomy={"A": ["B"], "B": ["A"]})
+        assert synonym_map.expand_specialization("A") == ["B"]
+    
+    def test_state_normalization(self, synonyms):
+        """Test state name and code normalization."""
+        assert synonyms.normalize_state("california") == "CA"
+        assert synonyms.normalize_state("New  York") == "NY"
+        assert synonyms.normalize_state("ny") == "NY"
+        assert synonyms.normalize_state("Ontario") == "Ontario"
+        assert synonyms.expand_state("CA") == ["California"]
+        assert synonyms.expand_state("California") == ["CA"]
+    
+    def test_from_file(self):
+        """Test loading the bundled synonyms file."""
+        synonym_map = SynonymMap.from_file(SYNONYMS_PATH)
+        
+        assert "braces" in synonym_map.expand_specialization("Orthodontics")
+        assert synonym_map.normalize_state("Texas") == "TX"
+
+class TestIndexTimeExpansion:
+    """Test cases for applying the synonym map when indexing."""
+    
+    @pytest.fixture
+    def planner(self, synonyms):
+        """Planner over an index built with the synonym map."""
+        index = ProviderIndex([
+            make_provider("ortho", state="CA", specializations=["Orthodontics"]),
+            make_provider("kids", state="NY", specializations=["Pediatric Dentistry"]),
+        ], synonyms=synonyms)
+        return QueryPlanner(index)
+    
+    def names(self, planner, query=None, state_code=None):
+        doc_ids = planner.plan(query=query, state_code=state_code).execute(planner.index)
+        return sorted(planner.index.providers[doc_id].name for doc_id in doc_ids)
+    
+    def test_synonym_queries_match_canonical_specializations(self, planner):
+        """Test that patient vocabulary matches indexed specializations."""
+        assert self.names(planner, "braces") == ["ortho"]
+        assert self.names(planner, '"kids dentist"') == ["kids"]
+        assert self.names(planner, "specialty:dentistry") == ["kids", "ortho"]
+    
+    def test_state_names_match_codes(self, planner):
+        """Test that state names match in both the query and the stateCode filter."""
+        assert self.names(planner, "california") == ["ortho"]
+        assert self.names(planner, state_code="New York") == ["kids"]
+        assert self.names(planner, state_code="ca") == ["ortho"]
+    
+    def test_synonyms_use_single_postings_lookup(self, planner):
+        """Test that synonym queries compile to one term scan, not an expansion."""
+        plan = planner.plan(query="braces")
+        
+        assert plan.explain() == "Term(_all:braces)[1]"
+    
+    def test_stored_providers_unchanged(self, planner):
+        """Test that expansion only affects the index, not returned providers."""
+        assert planner.index.providers[0].specializations == ["Orthodontics"]
+        assert planner.index.providers[0].state == "CA"
+
+if __name__ == "__main__":
+    pytest.main([__file__])